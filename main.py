@@ -1,13 +1,216 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, HttpUrl
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import asyncio
+from cachetools import TTLCache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, wraps
+import ijson
 import json
+from lxml import etree
+import lxml.html
+import orjson
+import os
 import re
-from typing import List, Optional
-from urllib.parse import urljoin, urlparse
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urlsplit
 
-app = FastAPI(title="Shopify Store Insights Fetcher")
+# one pooled connector shared by every request so keep-alive connections get reused
+MAX_CONNECTIONS = 32
+# shopify's edge throws the odd gateway error under load, so those get a couple of quick retries
+RETRY_ATTEMPTS = 2
+RETRY_BACKOFF = 0.2
+RETRY_STATUSES = {502, 503, 504}
+
+# anything bigger than this isn't a storefront page, and we don't want it sitting in memory
+MAX_PAGE_BYTES = 5_000_000
+PAGE_CHUNK_SIZE = 65536
+HTML_CONTENT_TYPES = {'text/html', 'application/xhtml+xml'}
+
+# shopify won't return more than 250 products per page of /products.json
+PRODUCTS_PAGE_SIZE = 250
+# big stores have thousands of products, this keeps the catalog (and memory) bounded
+MAX_CATALOG_PRODUCTS = 1000
+
+# parsing and extraction are CPU bound, so they get their own processes instead of blocking the event loop
+PARSE_WORKERS = os.cpu_count()
+
+# recently fetched stores are kept around and revalidated with ETag/Last-Modified instead of re-scraped
+CACHE_SIZE = 512
+CACHE_TTL = 300
+
+# requests that come in within this many seconds of each other get fetched as one batch
+BATCH_WINDOW = 0.02
+# so nobody sends us a whole store directory in one go
+MAX_BATCH_URLS = 20
+
+# these patterns will help us extract usernames from social media URLs
+_SOCIAL_PATTERNS = {
+    'instagram': re.compile(r'instagram\.com/([^/\s?]+)'),
+    'facebook': re.compile(r'facebook\.com/([^/\s?]+)'),
+    'twitter': re.compile(r'twitter\.com/([^/\s?]+)'),
+    'tiktok': re.compile(r'tiktok\.com/@([^/\s?]+)')
+}
+
+# policy keywords mapped to the insight they fill - longer phrases like "refund policy" already contain these
+_POLICY_KEYWORDS = {
+    'privacy': 'privacy',
+    'return': 'return',
+    'refund': 'return'
+}
+# one alternation so each link gets scanned once for every keyword instead of once per keyword
+_POLICY_RE = re.compile('|'.join(map(re.escape, _POLICY_KEYWORDS)))
+
+# these are the types of links people usually care about - "contact us", "order tracking" etc. already contain these
+# shortest keywords first since they're the cheapest substring checks
+_LINK_KEYWORDS = {
+    'blog': 'blog',
+    'news': 'blog',
+    'track': 'track_order',
+    'order': 'track_order',
+    'contact': 'contact',
+    'articles': 'blog'
+}
+_LINK_TYPES = set(_LINK_KEYWORDS.values())
+
+# this regex will find email addresses in the page text
+# the lookbehind means a match can only start at the beginning of a run of address characters, so a long
+# junk run without an @ gets scanned once instead of once per word boundary inside it
+_EMAIL_RE = re.compile(r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}\b')
+
+# this is a basic phone number finder - optional country code, optional (area code), then two digit groups
+# separators are a single space/dash/dot so long runs of whitespace can't turn into "phone numbers"
+_PHONE_RE = re.compile(r'(?<!\d)(?:\+?\d{1,3}[ \-.]?)?(?:\(\d{2,4}\)[ \-.]?|\d{2,5}[ \-.]?)\d{3,5}[ \-.]?\d{3,5}(?!\d)')
+
+def _has_class(name: str) -> str:
+    # xpath version of the css ".name" check - matches whole class names only, like a browser would
+    return "contains(concat(' ', normalize-space(@class), ' '), ' %s ')" % name
+
+# all the xpaths below get compiled once here instead of every time a page is parsed
+
+# css selectors we report back, in order - the first one with any matches wins
+_HERO_PRODUCT_SELECTORS = [
+    '.product-item', '.product-card', '.featured-product',
+    '[data-product-id]', '.product', '.grid-product__content'
+]
+
+def _selector_xpath(selector: str) -> str:
+    # only handles the two shapes we use above - ".class" and "[attribute]"
+    if selector.startswith('['):
+        return '//*[@%s]' % selector[1:-1]
+    return '//*[%s]' % _has_class(selector[1:])
+
+def _matches_selector(element: lxml.html.HtmlElement, selector: str) -> bool:
+    if selector.startswith('['):
+        return element.get(selector[1:-1]) is not None
+    return selector[1:] in element.get('class', '').split()
+
+# every hero selector in one union so the page only gets walked once
+_HERO_PRODUCTS_XPATH = etree.XPath(' | '.join(map(_selector_xpath, _HERO_PRODUCT_SELECTORS)))
+
+# the product name inside a hero product card
+_HERO_TITLE_XPATH = etree.XPath('(.//h2 | .//h3 | .//h4 | .//*[%s])[1]' % _has_class('product-title'))
+
+_ANCHORS_XPATH = etree.XPath('//a[@href]')
+
+# the usual "about us" spots, checked in order
+_ABOUT_XPATHS = [
+    etree.XPath('//*[%s]' % _has_class('about')),
+    etree.XPath('//*[@id="about"]'),
+    etree.XPath('//*[%s]' % _has_class('brand-story')),
+    etree.XPath('//*[%s]' % _has_class('our-story'))
+]
+_META_DESCRIPTION_XPATH = etree.XPath('//meta[@name="description"]')
+
+# places where contact info usually lives, same as "footer, address, [class*=contact], [id*=contact]"
+_CONTACT_AREAS_XPATH = etree.XPath('//footer | //address | //*[contains(@class, "contact")] | //*[contains(@id, "contact")]')
+
+# common ways themes lay out FAQs - <details> blocks or accordion items
+_FAQ_ITEMS_XPATH = etree.XPath('//details | //*[%s] | //*[%s]' % (_has_class('faq-item'), _has_class('accordion-item')))
+_FAQ_QUESTION_XPATH = etree.XPath('(.//summary | .//*[%s] | .//h3 | .//h4)[1]' % _has_class('question'))
+_FAQ_ANSWER_XPATH = etree.XPath('(.//*[%s] | .//*[%s] | .//p)[1]' % (_has_class('answer'), _has_class('content')))
+
+# structured data blocks - lots of themes describe the store and its FAQs here
+# smart_strings=False hands back plain str, which is what orjson wants
+_JSON_LD_XPATH = etree.XPath('//script[@type="application/ld+json"]/text()', smart_strings=False)
+# visible text only - get_text() never gave us the insides of script and style tags either
+_TEXT_XPATH = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]', smart_strings=False)
+
+@lru_cache(maxsize=16)
+def _html_parser(charset: Optional[str]) -> lxml.html.HTMLParser:
+    # parsers get reused instead of built per page, and we never look at comments, whitespace-only
+    # text or the id index, so libxml2 doesn't have to build any of that
+    return lxml.html.HTMLParser(encoding=charset, remove_comments=True, remove_blank_text=True, collect_ids=False)
+
+def _parse_html(content: bytes, charset: Optional[str] = None) -> lxml.html.HtmlElement:
+    # use the charset from the Content-Type header if we got one, otherwise lxml goes off the <meta> tag
+    try:
+        parser = _html_parser(charset)
+    except LookupError:
+        parser = _html_parser(None)  # made up charset in the header, let lxml work it out from the page
+    try:
+        return lxml.html.document_fromstring(content, parser=parser)
+    except etree.ParserError:
+        # empty, whitespace-only or comment-only page - nothing to extract, but not an error either
+        return lxml.html.document_fromstring('<html><body></body></html>')
+
+def _url_joiner(base_url: str) -> Callable[[str], str]:
+    # split the base URL once up front - most hrefs are absolute or root-relative and don't need urljoin at all
+    base = urlsplit(base_url)
+    base_prefix = f'{base.scheme}://{base.netloc}'
+    
+    def join(href: str) -> str:
+        if href.startswith(('http://', 'https://')):
+            return href
+        if href.startswith('//'):
+            return f'{base.scheme}:{href}'
+        if href.startswith('/'):
+            return base_prefix + href
+        return urljoin(base_url, href)  # relative paths, ?query, #fragment etc.
+    return join
+
+def _json_ld_objects(tree: lxml.html.HtmlElement, types: set) -> List[dict]:
+    # pulls every JSON-LD object with one of the given @types out of the page, including ones nested in @graph
+    objects = []
+    for blob in _JSON_LD_XPATH(tree):
+        try:
+            data = orjson.loads(blob)
+        except orjson.JSONDecodeError:
+            continue  # some themes ship broken JSON-LD, just skip it
+        
+        stack = data if isinstance(data, list) else [data]
+        while stack:
+            item = stack.pop(0)
+            if not isinstance(item, dict):
+                continue
+            item_types = item.get('@type')
+            if isinstance(item_types, str):
+                item_types = [item_types]
+            if isinstance(item_types, list):
+                # junk like dicts or lists in @type isn't hashable, only real type names count
+                item_types = [t for t in item_types if isinstance(t, str)]
+            if isinstance(item_types, list) and types.intersection(item_types):
+                objects.append(item)
+            if isinstance(item.get('@graph'), list):
+                stack.extend(item['@graph'])
+    return objects
+
+def _text(element: lxml.html.HtmlElement, separator: str = '') -> str:
+    # same idea as BeautifulSoup's get_text(separator, strip=True)
+    return separator.join(filter(None, (part.strip() for part in _TEXT_XPATH(element))))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # one shared aiohttp session for the whole app so we're not reconnecting on every request
+    await fetcher.start()
+    batcher.start()
+    yield
+    await batcher.close()
+    await fetcher.close()
+
+app = FastAPI(title="Shopify Store Insights Fetcher", lifespan=lifespan)
 
 class BrandInsights(BaseModel):
     website_url: str
@@ -24,239 +227,509 @@ class BrandInsights(BaseModel):
 class WebsiteRequest(BaseModel):
     website_url: HttpUrl
 
+class BatchWebsiteRequest(BaseModel):
+    website_urls: List[HttpUrl]
+
+class BatchInsightsResult(BaseModel):
+    website_url: str
+    insights: Optional[BrandInsights] = None
+    error: Optional[str] = None
+
 class ShopifyInsightsFetcher:
     def __init__(self):
-        self.session = requests.Session()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.pool: Optional[ProcessPoolExecutor] = None
+        # url -> (etag, last_modified, insights)
+        self.cache = TTLCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    
+    async def start(self):
         # basically we're pretending to be a real browser here so websites don't block us
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # and asking for compressed responses since html shrinks a lot with gzip
+        self.session = aiohttp.ClientSession(
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8',
+                'Accept-Encoding': 'gzip, deflate'
+            },
+            connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        self.pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
     
-    def fetch_insights(self, url: str) -> BrandInsights:
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+    
+    async def _parse_in_pool(self, func: Callable, *args):
+        # a worker that dies mid-parse (OOM on a huge page, say) breaks the whole pool for good,
+        # so swap in a fresh one and give it one more go before giving up on this request
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self.pool
+            try:
+                return await loop.run_in_executor(pool, func, *args)
+            except BrokenProcessPool:
+                if self.pool is pool:  # other requests may have already replaced it
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self.pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        raise HTTPException(status_code=503, detail="Page parser unavailable, try again")
+    
+    @asynccontextmanager
+    async def _request(self, url: str, **kwargs):
+        # gateway errors get retried before the caller ever sees the response
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            response = await self.session.get(url, **kwargs)
+            if response.status not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS:
+                break
+            response.release()
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        try:
+            yield response
+        finally:
+            response.release()
+    
+    async def _get(self, url: str, headers: Optional[dict] = None) -> Tuple[aiohttp.ClientResponse, bytes]:
+        async with self._request(url, headers=headers) as response:
+            # read the body here so the connection can go straight back to the pool
+            return response, await self._read_page(response)
+    
+    @staticmethod
+    async def _read_page(response: aiohttp.ClientResponse) -> bytes:
+        # the headers show up before the body, so PDFs, images and huge files get turned away before we download them
+        if 200 <= response.status < 300:
+            content_type = response.content_type.lower()
+            if 'Content-Type' in response.headers and content_type not in HTML_CONTENT_TYPES:
+                raise HTTPException(status_code=415, detail=f"Not an HTML page: {content_type}")
+            if response.content_length is not None and response.content_length > MAX_PAGE_BYTES:
+                raise HTTPException(status_code=413, detail="Page is too large")
+        
+        # Content-Length can be missing or wrong, so keep count while the body streams in too
+        chunks = []
+        total = 0
+        async for chunk in response.content.iter_chunked(PAGE_CHUNK_SIZE):
+            total += len(chunk)
+            if total > MAX_PAGE_BYTES:
+                raise HTTPException(status_code=413, detail="Page is too large")
+            chunks.append(chunk)
+        return b''.join(chunks)
+    
+    async def fetch_insights(self, url: str) -> BrandInsights:
+        # if we've seen this store recently, just ask whether the homepage changed since then
+        cached = self.cache.get(url)
+        headers = {}
+        if cached is not None:
+            etag, last_modified, cached_insights = cached
+            if not etag and not last_modified:
+                return cached_insights  # nothing to revalidate with, so trust it until it expires
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        # products.json doesn't depend on the homepage so it can load while we parse - unless we might
+        # not need it at all, then it waits until we know the homepage changed
+        catalog_task = None
+        if cached is None:
+            catalog_task = asyncio.create_task(self._get_product_catalog(url))
         try:
             # this checks if the website is actually working first
-            response = self.session.get(url, timeout=10)
-            if response.status_code == 404:
+            response, content = await self._get(url, headers)
+            if response.status == 404:
                 raise HTTPException(status_code=401, detail="Website not found")
             response.raise_for_status()
             
-            insights = BrandInsights(website_url=url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # now let's grab all the important stuff from the store
-            insights.product_catalog = self._get_product_catalog(url)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if cached is not None and (response.status == 304 or (etag and etag == cached[0])):
+                # nothing changed, so the old insights are still good - the entry keeps its original
+                # expiry though, since the catalog and FAQs live on other pages we didn't check
+                return cached[2]
             
-            # this gets the featured products from the main page
-            insights.hero_products = self._get_hero_products(soup)
+            if catalog_task is None:
+                catalog_task = asyncio.create_task(self._get_product_catalog(url))
             
-            # finding those policy pages
-            insights.privacy_policy = self._get_policy_link(soup, url, 'privacy')
-            insights.return_policy = self._get_policy_link(soup, url, 'return')
+            # a worker process parses the homepage and pulls everything out of it, the event loop just waits
+            homepage = await self._parse_in_pool(_parse_and_extract, content, response.charset, url)
+            faq_link = homepage.pop('faq_link')
+            insights = BrandInsights(website_url=url, **homepage)
             
             # digging for FAQs
-            insights.faqs = self._get_faqs(soup, url)
-            
-            # social media 
-            insights.social_handles = self._get_social_handles(soup)
-            
-            # finding ways to contact them
-            insights.contact_details = self._get_contact_details(soup)
+            insights.faqs = await self._get_faqs(faq_link)
             
-            # what's this brand about?
-            insights.brand_context = self._get_brand_context(soup)
-            
-            # other useful links we can find
-            insights.important_links = self._get_important_links(soup, url)
+            # now let's grab all the important stuff from the store
+            insights.product_catalog = await catalog_task
             
+            self.cache[url] = (etag, last_modified, insights)
             return insights
             
-        except requests.exceptions.RequestException:
+        except HTTPException:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
             raise HTTPException(status_code=500, detail="Error fetching website data")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+        finally:
+            # nothing to do with the catalog if the homepage failed
+            if catalog_task is not None and not catalog_task.done():
+                catalog_task.cancel()
     
-    def _get_product_catalog(self, url: str) -> List[dict]:
+    async def _get_product_catalog(self, url: str) -> List[dict]:
+        products = []
         try:
             # mostly every shopify store has /products.json
             products_url = urljoin(url, '/products.json')
-            response = self.session.get(products_url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                products = []
-                for product in data.get('products', []):
-                    # just grabbing the basic stuff we need from each product
-                    products.append({
-                        'id': product.get('id'),
-                        'title': product.get('title'),
-                        'handle': product.get('handle'),
-                        'product_type': product.get('product_type'),
-                        'vendor': product.get('vendor'),
-                        'tags': product.get('tags', '').split(',') if product.get('tags') else []
-                    })
-                return products
-        except:
-            # if something goes wrong, just return empty list
+            page = 1
+            while len(products) < MAX_CATALOG_PRODUCTS:
+                params = {'limit': PRODUCTS_PAGE_SIZE, 'page': page}
+                async with self._request(products_url, params=params) as response:
+                    if response.status != 200:
+                        break
+                    page_count = 0
+                    # ijson hands us one product at a time so the whole page never sits in memory
+                    async for product in ijson.items(response.content, 'products.item'):
+                        page_count += 1
+                        # just grabbing the basic stuff we need from each product
+                        products.append({
+                            'id': product.get('id'),
+                            'title': product.get('title'),
+                            'handle': product.get('handle'),
+                            'product_type': product.get('product_type'),
+                            'vendor': product.get('vendor'),
+                            'tags': product.get('tags', '').split(',') if product.get('tags') else []
+                        })
+                        if len(products) >= MAX_CATALOG_PRODUCTS:
+                            break
+                if page_count < PRODUCTS_PAGE_SIZE:
+                    break  # a short page means that was the last one
+                page += 1
+        except Exception:
+            # if something goes wrong, just keep whatever we got so far
             pass
-        return []
+        return products
+    
+    @staticmethod
+    def _scan_anchors(tree: lxml.html.HtmlElement) -> List[tuple]:
+        # walk the DOM for links once and let every link-based extractor reuse the result
+        # everything gets lowercased here, once per link, so the extractors never have to
+        anchors = []
+        for link in _ANCHORS_XPATH(tree):
+            raw_href = link.get('href')
+            # text_content() is collected inside libxml2 - the keyword checks don't care about the extra whitespace
+            anchors.append((raw_href.lower(), link.text_content().lower(), raw_href))
+        return anchors
     
-    def _get_hero_products(self, soup: BeautifulSoup) -> List[dict]:
+    @staticmethod
+    def _get_hero_products(tree: lxml.html.HtmlElement) -> List[dict]:
         hero_products = []
+        
         # we're looking for common ways shopify sites display products on their homepage
-        product_selectors = [
-            '.product-item', '.product-card', '.featured-product',
-            '[data-product-id]', '.product', '.grid-product__content'
-        ]
+        found = {}
+        for element in _HERO_PRODUCTS_XPATH(tree):
+            for selector in _HERO_PRODUCT_SELECTORS:
+                if _matches_selector(element, selector):
+                    found.setdefault(selector, []).append(element)
         
-        for selector in product_selectors:
-            products = soup.select(selector)
+        for selector in _HERO_PRODUCT_SELECTORS:
+            products = found.get(selector)
             if products:
                 # let's grab the first few products we find
                 for product in products[:5]:
-                    title_elem = product.find(['h2', 'h3', 'h4', '.product-title'])
+                    title_elem = _HERO_TITLE_XPATH(product)
                     if title_elem:
                         hero_products.append({
-                            'title': title_elem.get_text(strip=True),
+                            'title': _text(title_elem[0]),
                             'selector_used': selector
                         })
                 break  # once we find products with one selector, we're done
         return hero_products
     
-    def _get_policy_link(self, soup: BeautifulSoup, base_url: str, policy_type: str) -> Optional[str]:
+    @staticmethod
+    def _get_policy_links(anchors: List[tuple], join: Callable[[str], str]) -> dict:
         # this will hunt for policy links on the page
-        keywords = {
-            'privacy': ['privacy', 'privacy policy'],
-            'return': ['return', 'refund', 'return policy', 'refund policy']
-        }
+        policy_links = {}
         
-        for link in soup.find_all('a', href=True):
-            link_text = link.get_text(strip=True).lower()
-            href = link['href'].lower()
-            
+        for href, link_text, raw_href in anchors:
             # basically checking if any of our keywords match the link text or URL
-            for keyword in keywords.get(policy_type, []):
-                if keyword in link_text or keyword in href:
-                    return urljoin(base_url, link['href'])
+            for field in (link_text, href):
+                for match in _POLICY_RE.finditer(field):
+                    policy_type = _POLICY_KEYWORDS[match.group()]
+                    if policy_type not in policy_links:  # first link wins, same as before
+                        policy_links[policy_type] = join(raw_href)
+            if len(policy_links) == 2:
+                break  # found both, no need to look at the rest
+        return policy_links
+    
+    @staticmethod
+    def _get_faq_link(anchors: List[tuple], join: Callable[[str], str]) -> Optional[str]:
+        # first let's see if there's a dedicated FAQ page
+        for href, link_text, raw_href in anchors:
+            if 'faq' in link_text or 'faq' in href:
+                return join(raw_href)
         return None
     
-    def _get_faqs(self, soup: BeautifulSoup, base_url: str) -> List[dict]:
+    async def _get_faqs(self, faq_link: Optional[str]) -> List[dict]:
         faqs = []
         
-        # first let's see if there's a dedicated FAQ page
-        faq_link = None
-        for link in soup.find_all('a', href=True):
-            if 'faq' in link.get_text(strip=True).lower() or 'faq' in link['href'].lower():
-                faq_link = urljoin(base_url, link['href'])
-                break
-        
         # if we find an FAQ page, let's scrape it
         if faq_link:
             try:
-                faq_response = self.session.get(faq_link, timeout=10)
-                faq_soup = BeautifulSoup(faq_response.content, 'html.parser')
-                
-                # this looks for common FAQ patterns on the page
-                qa_pairs = faq_soup.find_all(['details', '.faq-item', '.accordion-item'])
-                for qa in qa_pairs[:5]:  # just grab the first 5 so we don't go crazy
-                    question = qa.find(['summary', '.question', 'h3', 'h4'])
-                    answer = qa.find(['.answer', '.content', 'p'])
-                    if question and answer:
-                        faqs.append({
-                            'question': question.get_text(strip=True),
-                            'answer': answer.get_text(strip=True)[:200] + '...'  # keep it short
-                        })
-            except:
+                faq_response, faq_content = await self._get(faq_link)
+                faqs = await self._parse_in_pool(_parse_faq_page, faq_content, faq_response.charset)
+            except Exception:
                 # if something breaks, just move on
                 pass
         
         return faqs
     
-    def _get_social_handles(self, soup: BeautifulSoup) -> dict:
+    @staticmethod
+    def _extract_faqs(faq_tree: lxml.html.HtmlElement) -> List[dict]:
+        faqs = []
+        
+        # a schema.org FAQPage gives us clean question/answer pairs without guessing at the layout
+        for faq_page in _json_ld_objects(faq_tree, {'FAQPage'}):
+            questions = faq_page.get('mainEntity') or []
+            if isinstance(questions, dict):
+                questions = [questions]
+            for question in questions:
+                if not isinstance(question, dict):
+                    continue
+                answer = question.get('acceptedAnswer')
+                if isinstance(answer, list):
+                    answer = answer[0] if answer else None
+                if isinstance(question.get('name'), str) and question['name'].strip() and isinstance(answer, dict) and isinstance(answer.get('text'), str):
+                    # answers are often little bits of html, so strip the tags off
+                    answer_text = _text(lxml.html.fragment_fromstring(answer['text'], create_parent='div'), ' ')
+                    faqs.append({
+                        'question': question['name'].strip(),
+                        'answer': answer_text[:200] + '...'  # keep it short
+                    })
+        if faqs:
+            return faqs[:5]
+        
+        # otherwise this looks for common FAQ patterns on the page
+        qa_pairs = _FAQ_ITEMS_XPATH(faq_tree)
+        for qa in qa_pairs[:5]:  # just grab the first 5 so we don't go crazy
+            question = _FAQ_QUESTION_XPATH(qa)
+            answer = _FAQ_ANSWER_XPATH(qa)
+            if question and answer:
+                faqs.append({
+                    'question': _text(question[0]),
+                    'answer': _text(answer[0])[:200] + '...'  # keep it short
+                })
+        return faqs
+    
+    @staticmethod
+    def _get_social_handles(anchors: List[tuple]) -> dict:
         social_handles = {}
-        # these patterns will help us extract usernames from social media URLs
-        social_patterns = {
-            'instagram': r'instagram\.com/([^/\s?]+)',
-            'facebook': r'facebook\.com/([^/\s?]+)',
-            'twitter': r'twitter\.com/([^/\s?]+)',
-            'tiktok': r'tiktok\.com/@([^/\s?]+)'
-        }
         
         # basically going through all links and seeing if any are social media
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            for platform, pattern in social_patterns.items():
-                match = re.search(pattern, href)
+        for _, _, raw_href in anchors:
+            for platform, pattern in _SOCIAL_PATTERNS.items():
+                match = pattern.search(raw_href)
                 if match and platform not in social_handles:
                     social_handles[platform] = match.group(1)  # this gives us the username
         
         return social_handles
     
-    def _get_contact_details(self, soup: BeautifulSoup) -> dict:
+    @staticmethod
+    def _get_contact_details(tree: lxml.html.HtmlElement, anchors: List[tuple]) -> dict:
         contact_details = {}
-        text = soup.get_text()
+        emails = []
+        phones = []
         
-        # this regex will find email addresses in the page text
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact_details['emails'] = list(set(emails[:3]))  # just keep the first 3 unique ones
+        # mailto: and tel: links give us exact contacts without any regex
+        for href, _, raw_href in anchors:
+            if href.startswith('mailto:'):
+                email = raw_href[7:].split('?')[0].strip()
+                if email:
+                    emails.append(email)
+            elif href.startswith('tel:'):
+                phone = raw_href[4:].strip()
+                if phone:
+                    phones.append(phone)
         
-        # this is a basic phone number finder - not perfect but does the job
-        phone_pattern = r'[\+]?[1-9]?[\d\s\-\(\)]{10,15}'
-        phones = re.findall(phone_pattern, text)
+        # otherwise fall back to scanning the text, but only where contact info actually lives
+        if not emails or not phones:
+            contact_areas = _CONTACT_AREAS_XPATH(tree)
+            text = ' '.join(_text(area, ' ') for area in contact_areas)
+            if not emails:
+                emails = _EMAIL_RE.findall(text)
+            if not phones:
+                # real phone numbers have somewhere between 8 and 15 digits
+                phones = [p for p in _PHONE_RE.findall(text) if 8 <= sum(c.isdigit() for c in p) <= 15]
+        
+        if emails:
+            contact_details['emails'] = list(dict.fromkeys(emails))[:3]  # just keep the first 3 unique ones
         if phones:
-            contact_details['phones'] = list(set([p.strip() for p in phones[:3]]))
+            contact_details['phones'] = list(dict.fromkeys(phones))[:3]
         
         return contact_details
     
-    def _get_brand_context(self, soup: BeautifulSoup) -> Optional[str]:
+    @staticmethod
+    def _get_brand_context(tree: lxml.html.HtmlElement) -> Optional[str]:
         # let's hunt for the "about us" type sections
-        about_selectors = ['.about', '#about', '.brand-story', '.our-story']
-        
-        for selector in about_selectors:
-            element = soup.select_one(selector)
+        for about_xpath in _ABOUT_XPATHS:
+            element = about_xpath(tree)
             if element:
-                text = element.get_text(strip=True)
+                text = _text(element[0])
                 # keep it reasonable length so we don't get a novel
                 return text[:300] + '...' if len(text) > 300 else text
         
+        # next best thing is the store describing itself in its structured data
+        for organization in _json_ld_objects(tree, {'Organization', 'OnlineStore', 'WebSite'}):
+            description = organization.get('description')
+            if isinstance(description, str) and description.strip():
+                return description.strip()[:300]
+        
         # if we can't find an about section, this will give us the meta description instead
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        meta_desc = _META_DESCRIPTION_XPATH(tree)
         if meta_desc:
-            return meta_desc.get('content', '')[:300]
+            return meta_desc[0].get('content', '')[:300]
         
         return None
     
-    def _get_important_links(self, soup: BeautifulSoup, base_url: str) -> dict:
+    @staticmethod
+    def _get_important_links(anchors: List[tuple], join: Callable[[str], str]) -> dict:
         important_links = {}
         
-        # these are the types of links people usually care about
-        link_keywords = {
-            'contact': ['contact', 'contact us'],
-            'track_order': ['track', 'order', 'track order', 'order tracking'],
-            'blog': ['blog', 'news', 'articles']
-        }
-        
-        for link in soup.find_all('a', href=True):
-            link_text = link.get_text(strip=True).lower()
-            href = link['href']
-            
+        for _, link_text, raw_href in anchors:
             # basically matching link text with our keywords
-            for key, keywords in link_keywords.items():
-                if key not in important_links:  # don't overwrite if we already found one
-                    for keyword in keywords:
-                        if keyword in link_text:
-                            important_links[key] = urljoin(base_url, href)
-                            break
+            for keyword, key in _LINK_KEYWORDS.items():
+                if key not in important_links and keyword in link_text:  # don't overwrite if we already found one
+                    important_links[key] = join(raw_href)
+            if len(important_links) == len(_LINK_TYPES):
+                break  # found one of each, no need to look at the rest
         
         return important_links
 
+def _worker_safe(func):
+    # exceptions raised in a worker get pickled on the way back, and lxml's errors drag along an
+    # error log that can't be pickled - so anything that goes wrong comes back as a plain RuntimeError
+    @wraps(func)
+    def wrapper(*args):
+        try:
+            return func(*args)
+        except Exception as e:
+            raise RuntimeError(f"{type(e).__name__}: {e}") from None
+    return wrapper
+
+@_worker_safe
+def _parse_and_extract(content: bytes, charset: Optional[str], url: str) -> dict:
+    # this runs in a worker process, so only plain picklable data goes in and out - never the lxml tree
+    tree = _parse_html(content, charset)
+    anchors = ShopifyInsightsFetcher._scan_anchors(tree)
+    join = _url_joiner(url)
+    policy_links = ShopifyInsightsFetcher._get_policy_links(anchors, join)
+    return {
+        # this gets the featured products from the main page
+        'hero_products': ShopifyInsightsFetcher._get_hero_products(tree),
+        # finding those policy pages
+        'privacy_policy': policy_links.get('privacy'),
+        'return_policy': policy_links.get('return'),
+        # where the FAQs live, we fetch that page next
+        'faq_link': ShopifyInsightsFetcher._get_faq_link(anchors, join),
+        # social media
+        'social_handles': ShopifyInsightsFetcher._get_social_handles(anchors),
+        # finding ways to contact them
+        'contact_details': ShopifyInsightsFetcher._get_contact_details(tree, anchors),
+        # what's this brand about?
+        'brand_context': ShopifyInsightsFetcher._get_brand_context(tree),
+        # other useful links we can find
+        'important_links': ShopifyInsightsFetcher._get_important_links(anchors, join)
+    }
+
+@_worker_safe
+def _parse_faq_page(content: bytes, charset: Optional[str]) -> List[dict]:
+    # same deal as _parse_and_extract but for the FAQ page
+    return ShopifyInsightsFetcher._extract_faqs(_parse_html(content, charset))
+
+class InsightsBatcher:
+    def __init__(self, fetcher: ShopifyInsightsFetcher, window: float = BATCH_WINDOW):
+        self.fetcher = fetcher
+        self.window = window
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.running = set()  # holding on to in-flight batches so they don't get garbage collected
+    
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.worker = asyncio.create_task(self._collect())
+    
+    async def close(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            await asyncio.gather(self.worker, *self.running, return_exceptions=True)
+            self.worker = None
+    
+    async def submit(self, url: str) -> BrandInsights:
+        # callers just await their own result, the batching happens behind the scenes
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((url, future))
+        return await future
+    
+    async def _collect(self):
+        while True:
+            # wait for the first request, then give others a short window to join it
+            batch = [await self.queue.get()]
+            await asyncio.sleep(self.window)
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            
+            task = asyncio.create_task(self._run_batch(batch))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+    
+    async def _run_batch(self, batch: List[tuple]):
+        # if the same store shows up more than once in a batch we only fetch it once
+        waiting = {}
+        for url, future in batch:
+            waiting.setdefault(url, []).append(future)
+        
+        results = await asyncio.gather(
+            *(self.fetcher.fetch_insights(url) for url in waiting),
+            return_exceptions=True
+        )
+        for futures, result in zip(waiting.values(), results):
+            for future in futures:
+                if future.done():
+                    continue  # the client already gave up on this one
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
 # this creates our fetcher instance that does all the heavy lifting
 fetcher = ShopifyInsightsFetcher()
+batcher = InsightsBatcher(fetcher)
 
 @app.post("/fetch-insights", response_model=BrandInsights)
 async def fetch_store_insights(request: WebsiteRequest):
     """give this a shopify URL and get back all the details"""
-    return fetcher.fetch_insights(str(request.website_url))
+    return await batcher.submit(str(request.website_url))
+
+@app.post("/fetch-insights/batch", response_model=List[BatchInsightsResult])
+async def fetch_store_insights_batch(request: BatchWebsiteRequest):
+    """same as /fetch-insights but for a list of stores, fetched all at once"""
+    if len(request.website_urls) > MAX_BATCH_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_URLS} URLs per batch")
+    
+    urls = [str(url) for url in request.website_urls]
+    results = await asyncio.gather(*(batcher.submit(url) for url in urls), return_exceptions=True)
+    
+    # one bad store shouldn't sink the whole batch, so errors get reported per URL
+    batch_results = []
+    for url, result in zip(urls, results):
+        if isinstance(result, HTTPException):
+            batch_results.append(BatchInsightsResult(website_url=url, error=result.detail))
+        elif isinstance(result, Exception):
+            batch_results.append(BatchInsightsResult(website_url=url, error=str(result)))
+        else:
+            batch_results.append(BatchInsightsResult(website_url=url, insights=result))
+    return batch_results
 
 @app.get("/")
 async def root():